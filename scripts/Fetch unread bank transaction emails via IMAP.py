@@ -9,8 +9,16 @@ class gmail_imap(TypedDict):
     email: str
     app_password: str
 
+# Number of messages requested per IMAP FETCH command
+FETCH_BATCH_SIZE = 100
+
+UID_RE = re.compile(rb'UID (\d+)')
+
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
 class EmailMessage(TypedDict):
-    id: str
+    id: str  # IMAP UID, stable across mailbox changes
     thread_id: str
     subject: str
     sender: str
@@ -42,11 +50,11 @@ def strip_html(html: str) -> str:
     if not html:
         return ""
     # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', html)
+    text = HTML_TAG_RE.sub('', html)
     # Decode HTML entities
     text = unescape(text)
     # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_RE.sub(' ', text).strip()
     return text
 
 def extract_body(msg) -> tuple:
@@ -128,8 +136,8 @@ def main(
     else:
         search_criteria = "(UNSEEN)"
     
-    # Search for unread emails
-    status, message_ids = mail.search(None, search_criteria)
+    # Search for unread emails by UID so IDs stay valid for later steps
+    status, message_ids = mail.uid("SEARCH", None, search_criteria)
     
     if status != "OK":
         mail.logout()
@@ -142,41 +150,63 @@ def main(
     
     emails = []
     
-    for email_id in email_ids:
+    # Fetch in batches using a message set to save one round trip per email
+    for i in range(0, len(email_ids), FETCH_BATCH_SIZE):
+        batch = email_ids[i:i + FETCH_BATCH_SIZE]
+        
         try:
-            # Fetch email using BODY.PEEK to not mark as read
-            status, msg_data = mail.fetch(email_id, "(BODY.PEEK[])")
-            
-            if status != "OK":
+            # Fetch emails using BODY.PEEK to not mark as read
+            status, msg_data = mail.uid("FETCH", b",".join(batch), "(BODY.PEEK[])")
+        except Exception as e:
+            # Skip batches the server fails on
+            print(f"Error fetching {len(batch)} emails starting at {batch[0].decode()}: {e}")
+            continue
+        
+        if status != "OK":
+            continue
+        
+        # Each message is a (envelope, raw_email) tuple followed by b')'
+        for j, item in enumerate(msg_data):
+            if not isinstance(item, tuple):
                 continue
             
-            # Parse email
-            raw_email = msg_data[0][1]
-            msg = email.message_from_bytes(raw_email)
-            
-            # Extract headers
-            subject = decode_mime_header(msg.get("Subject", ""))
-            sender = decode_mime_header(msg.get("From", ""))
-            date = msg.get("Date", "")
-            message_id = msg.get("Message-ID", "")
-            thread_id = msg.get("Thread-Index", "") or message_id
-            
-            # Extract body
-            body_text, body_html = extract_body(msg)
+            # The UID may also come after the literal, as b' UID n)'
+            uid_match = UID_RE.search(item[0])
+            if not uid_match and j + 1 < len(msg_data) and isinstance(msg_data[j + 1], bytes):
+                uid_match = UID_RE.search(msg_data[j + 1])
+            if not uid_match:
+                print(f"Skipping email without UID in FETCH response: {item[0]!r}")
+                continue
+            email_id = uid_match.group(1)
             
-            emails.append({
-                "id": email_id.decode(),
-                "thread_id": thread_id,
-                "subject": subject,
-                "sender": sender,
-                "date": date,
-                "body_text": body_text,
-                "body_html": body_html
-            })
-        except Exception as e:
-            # Skip problematic emails
-            print(f"Error processing email {email_id}: {e}")
-            continue
+            try:
+                # Parse email
+                raw_email = item[1]
+                msg = email.message_from_bytes(raw_email)
+                
+                # Extract headers
+                subject = decode_mime_header(msg.get("Subject", ""))
+                sender = decode_mime_header(msg.get("From", ""))
+                date = msg.get("Date", "")
+                message_id = msg.get("Message-ID", "")
+                thread_id = msg.get("Thread-Index", "") or message_id
+                
+                # Extract body
+                body_text, body_html = extract_body(msg)
+                
+                emails.append({
+                    "id": email_id.decode(),
+                    "thread_id": thread_id,
+                    "subject": subject,
+                    "sender": sender,
+                    "date": date,
+                    "body_text": body_text,
+                    "body_html": body_html
+                })
+            except Exception as e:
+                # Skip problematic emails
+                print(f"Error processing email {email_id}: {e}")
+                continue
     
     mail.logout()
     
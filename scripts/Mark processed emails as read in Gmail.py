@@ -5,6 +5,9 @@ class gmail_imap(TypedDict):
     email: str
     app_password: str
 
+# Maximum number of message IDs per STORE command
+STORE_BATCH_SIZE = 500
+
 def main(
     gmail_imap_resource: gmail_imap,
     email_ids: List[str]
@@ -14,7 +17,7 @@ def main(
     
     Args:
         gmail_imap_resource: Gmail IMAP credentials
-        email_ids: List of email IDs to mark as read
+        email_ids: List of email UIDs to mark as read
     
     Returns:
         Dictionary with success status and count of processed emails
@@ -40,18 +43,24 @@ def main(
     processed_count = 0
     failed_count = 0
     
-    for email_id in email_ids:
+    # Mark as read in batches by adding \Seen flag to a whole message set
+    for i in range(0, len(email_ids), STORE_BATCH_SIZE):
+        batch = email_ids[i:i + STORE_BATCH_SIZE]
+        
         try:
-            # Mark as read by adding \Seen flag
-            status, _ = mail.store(email_id.encode(), '+FLAGS', '\\Seen')
+            status, data = mail.uid("STORE", ",".join(batch), '+FLAGS', '\\Seen')
             
             if status == "OK":
-                processed_count += 1
+                # Server answers with one FETCH response per updated message
+                updated = min(len(batch), sum(1 for item in data if item))
             else:
-                failed_count += 1
+                updated = 0
         except Exception as e:
-            print(f"Error marking email {email_id} as read: {e}")
-            failed_count += 1
+            print(f"Error marking emails {batch[0]}..{batch[-1]} as read: {e}")
+            updated = 0
+        
+        processed_count += updated
+        failed_count += len(batch) - updated
     
     mail.logout()
     
@@ -1,7 +1,9 @@
 import re
-import quopri
+import logging
 from typing import TypedDict, List, Optional
 
+log = logging.getLogger(__name__)
+
 class EmailMessage(TypedDict):
     id: str
     thread_id: str
@@ -22,14 +24,98 @@ class TransactionData(TypedDict):
     confidence: float
     raw_text: str
 
+# Amount patterns - Monto: label followed by the amount, tried in order over the whole HTML
+MONTO_PATTERNS = [
+    # Table row with the amount in the next cell, currency optional
+    # Handles: <td><p>Monto:</p></td><td...><p>CRC 1,850.00</p></td>
+    re.compile(r'Monto:\s*</p>.*?<p>\s*(CRC|USD|₡|US\$|\$)?\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})\s*</p>', re.IGNORECASE | re.DOTALL),
+    # Any currency and amount following the label
+    re.compile(r'Monto:.*?(CRC|USD|₡|US\$|\$)\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})', re.IGNORECASE | re.DOTALL),
+]
+
+# Currency followed by amount anywhere in the email
+CURRENCY_AMOUNT_RE = re.compile(r'(CRC|USD|₡|\$)\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})', re.IGNORECASE)
+
+# Lowercased substrings required by MONTO_PATTERNS or CURRENCY_AMOUNT_RE
+AMOUNT_MARKERS = ('monto', 'crc', 'usd', '₡', '$')
+
+# Matched currency token (lowercased) to ISO code
+CURRENCY_CODES = {'crc': 'CRC', 'usd': 'USD', 'us$': 'USD', '₡': 'CRC', '$': 'USD'}
+
+# Preferred currency token when an email mentions several
+CURRENCY_PRIORITY = ('crc', 'usd', '₡', '$')
+
+# Merchant patterns - Comercio: label in a table row with the merchant in the next cell
+# Handles: <td><p>Comercio:</p></td><td...><p>CARIARI MARKET</p></td>
+COMERCIO_PATTERNS = [
+    # Pattern for table structure with Comercio label
+    re.compile(r'<p>\s*Comercio:\s*</p>\s*</td>\s*<td[^>]*>\s*<p>\s*([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,100}?)\s*</p>', re.IGNORECASE | re.DOTALL),
+    # More flexible pattern
+    re.compile(r'Comercio:\s*</p>.*?<p>\s*([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,100}?)\s*</p>', re.IGNORECASE | re.DOTALL),
+    # Even more flexible - just look for Comercio: followed by merchant name
+    re.compile(r'Comercio:.*?<p>\s*([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,100}?)\s*</p>', re.IGNORECASE | re.DOTALL),
+]
+
+# Merchant name in subjects like "Notificación de transacción CARIARI MARKET 12-10-2024"
+SUBJECT_MERCHANT_RE = re.compile(r'(?:transacci[oó]n|transaction)\s+(.+?)\s+\d{1,2}-\d{1,2}-\d{4}', re.IGNORECASE)
+
+# General merchant patterns for plain text emails
+MERCHANT_PATTERNS = [
+    re.compile(r'(?:comercio|establecimiento)[:\s]+([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,50})(?:\s+|<|$)', re.IGNORECASE),
+    re.compile(r'(?:at|from|merchant)[:\s]+([A-Z][A-Za-z0-9\s&\.\-]{2,50})(?:\s+|<|$)', re.IGNORECASE),
+]
+
+# Merchant name cleanup
+WHITESPACE_RE = re.compile(r'\s+')
+TRAILING_PUNCT_RE = re.compile(r'[,\.\-<>]+$')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Last 4 card digits, matched against lowercased text: masked digits first,
+# then the first 4 digits after a card keyword on the same line
+CARD_MASK_RE = re.compile(r'(?:\*+|x{4,})(\d{4})')
+CARD_KEYWORD_RE = re.compile(r'(?:master|visa|tarjeta|card).*?(\d{4})')
+
+# Date and time in the row after a Fecha: label, preferred over any other date
+FECHA_RE = re.compile(r'Fecha:\s*</p>.*?<p>\s*([A-Za-z]{3}\s+\d{1,2},\s+\d{4},\s+\d{2}:\d{2})', re.IGNORECASE | re.DOTALL)
+
+# Any other date: "Oct 12, 2024", 10/12/2024, 2024-10-12 or 12-10-2024
+DATE_RE = re.compile(
+    r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|Ene|Abr|Ago|Dic)\s+\d{1,2},\s+\d{4}'
+    r'|\d{1,2}/\d{1,2}/\d{2,4}'
+    r'|\d{4}-\d{2}-\d{2}'
+    r'|\d{1,2}-\d{1,2}-\d{2,4}',
+    re.IGNORECASE
+)
+
+# Soft line breaks with trailing whitespace (= \n), left over after the plain ones
+SOFT_BREAK_WS_RE = re.compile(r'=[ \t]+\r?\n')
+
+# Runs of quoted-printable escapes (e.g. =C3=B3)
+QP_ESCAPES_RE = re.compile(r'(?:=[0-9A-Fa-f]{2})+')
+
+# Transaction type keywords, matched against lowercased text
+DEBIT_RE = re.compile(r'compra|purchase|debit|d[eé]bito|retiro|withdrawal|pago|payment|cargo|charge|gasto|spent')
+CREDIT_RE = re.compile(r'cr[eé]dito|credit|dep[oó]sito|deposit|reembolso|refund|devoluci[oó]n|abono|payment received')
+
+def decode_hex_escapes(match: re.Match) -> str:
+    """Decode a run of =XX escapes as UTF-8 bytes."""
+    return bytes.fromhex(match.group(0).replace('=', '')).decode('utf-8', errors='ignore')
+
 def decode_quoted_printable(text: str) -> str:
     """Decode quoted-printable encoding (e.g., =3D becomes =)."""
-    try:
-        # Handle quoted-printable encoding
-        decoded = quopri.decodestring(text.encode('latin-1')).decode('utf-8', errors='ignore')
-        return decoded
-    except:
+    # Nothing to decode without escapes or soft line breaks
+    if '=' not in text:
         return text
+    
+    # Remove soft line breaks (=\n) before decoding so escaped '=' survive
+    text = text.replace('=\r\n', '').replace('=\n', '')
+    
+    # Rare soft breaks with trailing whitespace after the '='
+    if '=' in text:
+        text = SOFT_BREAK_WS_RE.sub('', text)
+    
+    # Decode consecutive escapes together so multi-byte characters stay intact
+    return QP_ESCAPES_RE.sub(decode_hex_escapes, text)
 
 def clean_html(html: str) -> str:
     """Clean and decode HTML content."""
@@ -37,76 +123,57 @@ def clean_html(html: str) -> str:
         return ""
     
     # Decode quoted-printable encoding
-    html = decode_quoted_printable(html)
-    
-    # Remove soft line breaks (=\n)
-    html = re.sub(r'=\s*\n', '', html)
-    
-    return html
+    return decode_quoted_printable(html)
 
-def extract_amount(text: str, html: str = "") -> Optional[tuple]:
-    """Extract amount and currency from text or HTML."""
-    # Clean HTML first
-    html_clean = clean_html(html)
-    combined = f"{text} {html_clean}"
-    
-    print(f"   🔍 Searching for amount...")
-    print(f"   Raw HTML sample: {html[:200]}")
-    print(f"   Cleaned HTML sample: {html_clean[:200]}")
+def extract_amount(text: str, html_clean: str = "") -> Optional[tuple]:
+    """Extract amount and currency from text or cleaned HTML."""
+    log.debug("   🔍 Searching for amount...")
     
-    # Pattern 1: Most specific - Monto: in table row with amount in next cell
-    # Handles: <td><p>Monto:</p></td><td...><p>CRC 1,850.00</p></td>
-    monto_patterns = [
-        # Pattern for table structure with Monto label
-        r'<p>\s*Monto:\s*</p>\s*</td>\s*<td[^>]*>\s*<p>\s*(CRC|USD|₡|US\$|\$)?\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})\s*</p>',
-        # More flexible pattern
-        r'Monto:\s*</p>.*?<p>\s*(CRC|USD|₡|US\$|\$)?\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})\s*</p>',
-        # Even more flexible - just look for Monto: followed by currency and amount
-        r'Monto:.*?(CRC|USD|₡|US\$|\$)\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})',
-    ]
-    
-    for i, pattern in enumerate(monto_patterns):
-        match = re.search(pattern, html_clean, re.IGNORECASE | re.DOTALL)
+    # Pattern 1: Most specific - Monto: label followed by the amount
+    for i, pattern in enumerate(MONTO_PATTERNS):
+        match = pattern.search(html_clean)
         if match:
-            groups = match.groups()
-            currency = groups[0] if groups[0] else 'CRC'
-            amount_str = groups[1]
-            
-            # Normalize currency
-            if currency in ['₡', 'CRC']:
-                currency = 'CRC'
-            elif currency in ['$', 'US$', 'USD']:
-                currency = 'USD'
+            # Normalize currency, defaulting to CRC when none is given
+            currency = CURRENCY_CODES.get((match.group(1) or '').lower(), 'CRC')
             
             # Parse amount
-            parsed_amount = parse_amount_string(amount_str)
+            parsed_amount = parse_amount_string(match.group(2))
             if parsed_amount:
-                print(f"   ✅ Found amount via Monto pattern {i+1}: {currency} {parsed_amount}")
+                log.debug("   ✅ Found amount via Monto pattern %d: %s %s", i + 1, currency, parsed_amount)
                 return float(parsed_amount), currency, 1.0
     
-    # Pattern 2: Look for currency followed by amount anywhere
-    currency_patterns = [
-        (r'CRC\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})', 'CRC'),
-        (r'USD\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})', 'USD'),
-        (r'₡\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})', 'CRC'),
-        (r'\$\s*([0-9]{1,3}(?:[,\.][0-9]{3})*[,\.][0-9]{2})', 'USD'),
-    ]
-    
-    for pattern, curr in currency_patterns:
-        match = re.search(pattern, combined, re.IGNORECASE)
-        if match:
-            amount_str = match.group(1)
-            parsed_amount = parse_amount_string(amount_str)
+    # Pattern 2: Look for currency followed by amount anywhere, text body first.
+    # Keep the first amount per currency token, then pick by CURRENCY_PRIORITY
+    # so e.g. an exchange rate in $ doesn't win over the CRC total.
+    found = {}
+    for source in (text, html_clean):
+        for match in CURRENCY_AMOUNT_RE.finditer(source):
+            token = match.group(1).lower()
+            if token in found:
+                continue
+            parsed_amount = parse_amount_string(match.group(2))
             if parsed_amount:
-                print(f"   ✅ Found amount via currency pattern: {curr} {parsed_amount}")
-                return float(parsed_amount), curr, 0.9
+                found[token] = parsed_amount
+        if CURRENCY_PRIORITY[0] in found:
+            break
+    
+    for token in CURRENCY_PRIORITY:
+        if token in found:
+            curr = CURRENCY_CODES[token]
+            log.debug("   ✅ Found amount via currency pattern: %s %s", curr, found[token])
+            return float(found[token]), curr, 0.9
     
-    print("   ❌ No amount pattern matched")
+    log.debug("   ❌ No amount pattern matched")
     return None
 
 def parse_amount_string(amount_str: str) -> Optional[str]:
     """Parse amount string handling different decimal/thousand separators."""
-    if ',' in amount_str and '.' in amount_str:
+    if len(amount_str) > 3 and amount_str[-3] in ',.' and amount_str[0].isdigit():
+        # Amount patterns always end in a separator plus two decimals, so
+        # the third-to-last character is the decimal separator
+        integer_part = amount_str[:-3].replace(',', '').replace('.', '')
+        amount_str = f"{integer_part}.{amount_str[-2:]}"
+    elif ',' in amount_str and '.' in amount_str:
         # Both present - determine which is decimal
         if amount_str.rindex(',') > amount_str.rindex('.'):
             # Comma is last, so it's decimal (European style)
@@ -133,124 +200,72 @@ def parse_amount_string(amount_str: str) -> Optional[str]:
     
     return None
 
-def extract_merchant(text: str, html: str = "", subject: str = "") -> Optional[tuple]:
-    """Extract merchant name from text, HTML, or subject."""
-    # Clean HTML first
-    html_clean = clean_html(html)
+def extract_merchant(combined: str, html_clean: str = "", subject: str = "") -> Optional[tuple]:
+    """Extract merchant name from cleaned HTML, subject, or combined text and HTML."""
+    log.debug("   🔍 Searching for merchant...")
     
-    print(f"   🔍 Searching for merchant...")
-    print(f"   Raw HTML sample: {html[:200]}")
-    print(f"   Cleaned HTML sample: {html_clean[:200]}")
-    
-    # Pattern 1: Most specific - Comercio: in table row with merchant in next cell
-    # Handles: <td><p>Comercio:</p></td><td...><p>CARIARI MARKET</p></td>
-    comercio_patterns = [
-        # Pattern for table structure with Comercio label
-        r'<p>\s*Comercio:\s*</p>\s*</td>\s*<td[^>]*>\s*<p>\s*([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,100}?)\s*</p>',
-        # More flexible pattern
-        r'Comercio:\s*</p>.*?<p>\s*([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,100}?)\s*</p>',
-        # Even more flexible - just look for Comercio: followed by merchant name
-        r'Comercio:.*?<p>\s*([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,100}?)\s*</p>',
-    ]
-    
-    for i, pattern in enumerate(comercio_patterns):
-        match = re.search(pattern, html_clean, re.IGNORECASE | re.DOTALL)
+    # Pattern 1: Most specific - Comercio: label followed by the merchant
+    for i, pattern in enumerate(COMERCIO_PATTERNS):
+        match = pattern.search(html_clean)
         if match:
             merchant = match.group(1).strip()
             # Clean up merchant name
-            merchant = re.sub(r'\s+', ' ', merchant)
-            merchant = re.sub(r'[,\.\-<>]+$', '', merchant)
+            merchant = WHITESPACE_RE.sub(' ', merchant)
+            merchant = TRAILING_PUNCT_RE.sub('', merchant)
             if len(merchant) >= 3:
-                print(f"   ✅ Found merchant via Comercio pattern {i+1}: {merchant}")
+                log.debug("   ✅ Found merchant via Comercio pattern %d: %s", i + 1, merchant)
                 return merchant, 1.0
     
     # Pattern 2: Try subject - often has merchant name
-    subject_match = re.search(r'(?:transacci[oó]n|transaction)\s+(.+?)\s+\d{1,2}-\d{1,2}-\d{4}', subject, re.IGNORECASE)
+    subject_match = SUBJECT_MERCHANT_RE.search(subject)
     if subject_match:
         merchant = subject_match.group(1).strip()
         if len(merchant) >= 3:
-            print(f"   ✅ Found merchant in subject: {merchant}")
+            log.debug("   ✅ Found merchant in subject: %s", merchant)
             return merchant, 0.95
     
     # Pattern 3: General patterns
-    combined = f"{text} {html_clean}"
-    patterns = [
-        r'(?:comercio|establecimiento)[:\s]+([A-ZÁÉÍÓÚÑa-záéíóúñ0-9][A-ZÁÉÍÓÚÑa-záéíóúñ0-9\s&\.\-]{2,50})(?:\s+|<|$)',
-        r'(?:at|from|merchant)[:\s]+([A-Z][A-Za-z0-9\s&\.\-]{2,50})(?:\s+|<|$)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, combined, re.IGNORECASE)
+    for pattern in MERCHANT_PATTERNS:
+        match = pattern.search(combined)
         if match:
             merchant = match.group(1).strip()
-            merchant = re.sub(r'\s+', ' ', merchant)
-            merchant = re.sub(r'[,\.\-<>]+$', '', merchant)
-            merchant = re.sub(r'<[^>]+>', '', merchant)
+            merchant = WHITESPACE_RE.sub(' ', merchant)
+            merchant = TRAILING_PUNCT_RE.sub('', merchant)
+            merchant = HTML_TAG_RE.sub('', merchant)
             if len(merchant) >= 3:
-                print(f"   ✅ Found merchant via general pattern: {merchant}")
+                log.debug("   ✅ Found merchant via general pattern: %s", merchant)
                 return merchant, 0.8
     
-    print("   ⚠️ No merchant pattern matched")
+    log.debug("   ⚠️ No merchant pattern matched")
     return None
 
-def extract_card_last_4(text: str, html: str = "") -> Optional[tuple]:
-    """Extract last 4 digits of card."""
-    html = clean_html(html)
-    combined = f"{text} {html}"
-    
-    patterns = [
-        r'\*+(\d{4})',
-        r'x{4,}(\d{4})',
-        r'(?:MASTER|VISA|tarjeta|card).*?(\d{4})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, combined, re.IGNORECASE)
-        if match:
-            return match.group(1), 1.0
+def extract_card_last_4(combined_lower: str) -> Optional[tuple]:
+    """Extract last 4 digits of card from lowercased text and HTML."""
+    match = CARD_MASK_RE.search(combined_lower) or CARD_KEYWORD_RE.search(combined_lower)
+    if match:
+        return match.group(1), 1.0
     
     return None
 
-def extract_transaction_type(text: str, html: str = "") -> tuple:
-    """Determine if transaction is DEBIT or CREDIT."""
-    combined = f"{text} {html}".lower()
-    
-    debit_keywords = [
-        'compra', 'purchase', 'debit', 'd[eé]bito', 'retiro', 'withdrawal', 
-        'pago', 'payment', 'cargo', 'charge', 'gasto', 'spent'
-    ]
-    credit_keywords = [
-        'cr[eé]dito', 'credit', 'dep[oó]sito', 'deposit', 'reembolso', 
-        'refund', 'devoluci[oó]n', 'abono', 'payment received'
-    ]
-    
-    for keyword in debit_keywords:
-        if re.search(keyword, combined):
-            return 'DEBIT', 0.9
-    
-    for keyword in credit_keywords:
-        if re.search(keyword, combined):
-            return 'CREDIT', 0.9
+def extract_transaction_type(combined_lower: str) -> tuple:
+    """Determine if transaction is DEBIT or CREDIT from lowercased text and HTML."""
+    if DEBIT_RE.search(combined_lower):
+        return 'DEBIT', 0.9
+    
+    if CREDIT_RE.search(combined_lower):
+        return 'CREDIT', 0.9
     
     return 'DEBIT', 0.3
 
-def extract_date(text: str, html: str = "", email_date: str = "") -> tuple:
-    """Extract transaction date from text/HTML or use email date."""
-    html = clean_html(html)
-    combined = f"{text} {html}"
-    
-    patterns = [
-        r'Fecha:\s*</p>.*?<p>\s*([A-Za-z]{3}\s+\d{1,2},\s+\d{4},\s+\d{2}:\d{2})',
-        r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|Ene|Feb|Mar|Abr|May|Jun|Jul|Ago|Sep|Oct|Nov|Dic)\s+\d{1,2},\s+\d{4}',
-        r'(\d{1,2}/\d{1,2}/\d{2,4})',
-        r'(\d{4}-\d{2}-\d{2})',
-        r'(\d{1,2}-\d{1,2}-\d{2,4})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, combined, re.IGNORECASE | re.DOTALL)
-        if match:
-            return match.group(1), 0.8
+def extract_date(combined: str, email_date: str = "") -> tuple:
+    """Extract transaction date from combined text and HTML or use email date."""
+    match = FECHA_RE.search(combined)
+    if match:
+        return match.group(1), 0.8
+    
+    match = DATE_RE.search(combined)
+    if match:
+        return match.group(0), 0.8
     
     return email_date, 0.5
 
@@ -261,40 +276,54 @@ def parse_transaction(email: EmailMessage) -> Optional[TransactionData]:
     subject = email.get('subject', '')
     
     if not text and not html:
-        print(f"⚠️ Email {email['id']}: No content found")
+        log.debug("⚠️ Email %s: No content found", email['id'])
         return None
     
-    print(f"\n📧 Parsing email {email['id']}")
-    print(f"   Subject: {subject[:100]}")
+    log.debug("📧 Parsing email %s", email['id'])
+    log.debug("   Subject: %.100s", subject)
+    
+    # Clean HTML once and share it between all extractors
+    html_clean = clean_html(html)
+    log.debug("   Raw HTML sample: %.200s", html)
+    log.debug("   Cleaned HTML sample: %.200s", html_clean)
+    
+    # Combine and lowercase once for the extractors that scan everything
+    combined = f"{text} {html_clean}"
+    combined_lower = combined.lower()
+    
+    # Every amount pattern needs one of these, skip emails that cannot match
+    if not any(marker in combined_lower for marker in AMOUNT_MARKERS):
+        log.debug("   ❌ FAILED: No amount markers found")
+        return None
     
     # Extract components
-    amount_result = extract_amount(text, html)
-    merchant_result = extract_merchant(text, html, subject)
-    card_result = extract_card_last_4(text, html)
-    transaction_type, type_confidence = extract_transaction_type(text, html)
-    date_str, date_confidence = extract_date(text, html, email.get("date", ""))
+    amount_result = extract_amount(text, html_clean)
+    merchant_result = extract_merchant(combined, html_clean, subject)
+    card_result = extract_card_last_4(combined_lower)
+    transaction_type, type_confidence = extract_transaction_type(combined_lower)
+    date_str, date_confidence = extract_date(combined, email.get("date", ""))
     
     if not amount_result:
-        print("   ❌ FAILED: No amount found")
+        log.debug("   ❌ FAILED: No amount found")
         return None
     
     amount, currency, amount_confidence = amount_result
-    print(f"   ✅ Amount: {currency} {amount}")
+    log.debug("   ✅ Amount: %s %s", currency, amount)
     
     confidence_scores = [amount_confidence, type_confidence, date_confidence]
     
     if merchant_result:
         merchant, merchant_confidence = merchant_result
         confidence_scores.append(merchant_confidence)
-        print(f"   ✅ Merchant: {merchant}")
+        log.debug("   ✅ Merchant: %s", merchant)
     else:
         merchant = "Unknown Merchant"
-        print(f"   ⚠️ Merchant: Not found (using default)")
+        log.debug("   ⚠️ Merchant: Not found (using default)")
     
     if card_result:
         card_last_4, card_confidence = card_result
         confidence_scores.append(card_confidence)
-        print(f"   ✅ Card: ****{card_last_4}")
+        log.debug("   ✅ Card: ****%s", card_last_4)
     else:
         card_last_4 = "****"
     
@@ -312,10 +341,22 @@ def parse_transaction(email: EmailMessage) -> Optional[TransactionData]:
         "raw_text": subject[:200]
     }
     
-    print(f"   ✅ SUCCESS: Parsed with confidence {transaction['confidence']}")
+    log.debug("   ✅ SUCCESS: Parsed with confidence %s", transaction['confidence'])
     
     return transaction
 
+def safe_parse_transaction(email: EmailMessage) -> Optional[TransactionData]:
+    """Parse a single email, reporting and skipping it on error."""
+    try:
+        return parse_transaction(email)
+    except Exception as e:
+        # Full traceback only when debugging, failures are expected in bulk runs
+        log.error(
+            "❌ Error parsing email %s: %s", email.get('id', 'unknown'), e,
+            exc_info=log.isEnabledFor(logging.DEBUG)
+        )
+        return None
+
 def main(emails: List[EmailMessage]) -> List[TransactionData]:
     """
     Parse transaction details from email bodies.
@@ -332,18 +373,7 @@ def main(emails: List[EmailMessage]) -> List[TransactionData]:
         print("⚠️ No emails to parse")
         return []
     
-    transactions = []
-    
-    for email in emails:
-        try:
-            transaction = parse_transaction(email)
-            if transaction:
-                transactions.append(transaction)
-        except Exception as e:
-            print(f"❌ Error parsing email {email.get('id', 'unknown')}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+    transactions = [t for t in map(safe_parse_transaction, emails) if t]
     
     print(f"\n✅ Successfully parsed {len(transactions)} transactions out of {len(emails)} emails")
     
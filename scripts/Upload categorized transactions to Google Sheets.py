@@ -1,3 +1,4 @@
+import operator
 import requests
 from typing import TypedDict, List
 from datetime import datetime
@@ -15,6 +16,21 @@ class TransactionData(TypedDict):
     confidence: float
     raw_text: str
 
+# Transaction fields written after the processed date, in column order
+ROW_FIELDS = operator.itemgetter(
+    "date",
+    "merchant",
+    "amount",
+    "transaction_type",
+    "card_last_4",
+    "confidence",
+    "raw_text"
+)
+
+# Shared session so the header check and append reuse one connection
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+
 def get_or_create_headers(token: str, spreadsheet_id: str, sheet_name: str) -> bool:
     """
     Check if headers exist, create them if not.
@@ -23,15 +39,14 @@ def get_or_create_headers(token: str, spreadsheet_id: str, sheet_name: str) -> b
         True if headers were created, False if they already existed
     """
     headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
+        "Authorization": f"Bearer {token}"
     }
     
     # Get first row to check for headers
     range_name = f"{sheet_name}!A1:H1"
     url = f"https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}/values/{range_name}"
     
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url, headers=headers)
     response.raise_for_status()
     
     data = response.json()
@@ -54,7 +69,7 @@ def get_or_create_headers(token: str, spreadsheet_id: str, sheet_name: str) -> b
         }
         
         url = f"https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}/values/{range_name}?valueInputOption=RAW"
-        response = requests.put(url, headers=headers, json=body)
+        response = SESSION.put(url, headers=headers, json=body)
         response.raise_for_status()
         
         return True
@@ -66,28 +81,13 @@ def append_transactions(token: str, spreadsheet_id: str, sheet_name: str, transa
     Append transactions to Google Sheets.
     """
     headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
+        "Authorization": f"Bearer {token}"
     }
     
     # Prepare rows
-    rows = []
-    email_ids = []
     processed_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    for transaction in transactions:
-        row = [
-            processed_date,
-            transaction["date"],
-            transaction["merchant"],
-            transaction["amount"],
-            transaction["transaction_type"],
-            transaction["card_last_4"],
-            transaction["confidence"],
-            transaction["raw_text"]
-        ]
-        rows.append(row)
-        email_ids.append(transaction["email_id"])
+    rows = [[processed_date, *ROW_FIELDS(transaction)] for transaction in transactions]
+    email_ids = [transaction["email_id"] for transaction in transactions]
     
     if not rows:
         return {
@@ -104,7 +104,7 @@ def append_transactions(token: str, spreadsheet_id: str, sheet_name: str, transa
         "values": rows
     }
     
-    response = requests.post(url, headers=headers, json=body)
+    response = SESSION.post(url, headers=headers, json=body)
     response.raise_for_status()
     
     result = response.json()